@@ -21,6 +21,8 @@ You must encode:
 
 from typing import Tuple, Iterable
 from typing import Tuple, Iterable
+from functools import lru_cache
+from itertools import combinations
 import math
 
 
@@ -35,28 +37,36 @@ def read_text(input_path):
 
 
 def read_dimacs(path):
-  clauses = []
+  # read the file as bytes; only the comment/header filter goes per line,
+  # all clause literals are split and converted in one go
+  with open(path, "rb") as f:
+    data = f.read()
+
   num_vars = 0
-  with open(path) as f:
-    current = []
-    for raw in f:
-      line = raw.strip()
-      if not line or line.startswith("c") or line.startswith("%"):
-        continue  # skip comments and markers
-      if line.startswith("p"):
-        parts = line.split()
-        # p cnf <num_vars> <num_clauses>
-        num_vars = int(parts[2])
-        continue
-      for tok in line.split():
-        if tok == "0":
-          if current:
-            clauses.append(current)
-            current = []
-        else:
-          current.append(int(tok))
-    if current:
-      clauses.append(current)
+  body = []
+  for line in data.splitlines():
+    line = line.strip()
+    if not line or line[:1] in (b"c", b"%"):
+      continue  # skip comments and markers
+    if line[:1] == b"p":
+      # p cnf <num_vars> <num_clauses>
+      num_vars = int(line.split()[2])
+      continue
+    body.append(line)
+
+  numbers = list(map(int, b" ".join(body).split()))
+
+  # every 0 ends a clause, list.index finds them without a python loop
+  clauses = []
+  start = 0
+  while start < len(numbers):
+    try:
+      end = numbers.index(0, start)
+    except ValueError:
+      end = len(numbers)
+    if end > start:
+      clauses.append(numbers[start:end])
+    start = end + 1
   return clauses, num_vars
 
 
@@ -74,28 +84,27 @@ def one_value_per_cell_helper(var_ls):
   for one box
   return [[at least one(or)] and [at most one (or)]]
   """
-  clauses = []
-
   # at least one
-  clauses.append(list(var_ls))
+  clauses = [list(var_ls)]
 
-  # at most one (can not have two values in same cell)
-  nr_var = len(var_ls)
-  for i in range(nr_var):
-      for j in range(i + 1, nr_var):
-          clauses.append([-var_ls[i], -var_ls[j]])
+  # at most one (can not have two values in same cell),
+  # all pairs come out of itertools instead of a python double loop
+  clauses.extend(map(list, combinations([-x for x in var_ls], 2)))
 
   return clauses
 
 
+# The variables of a group are evenly spaced in var(r,c,v) = r*N*N + c*N + v,
+# so every group below is a range() with the matching stride.
+
 def one_value_per_cel(N):
   clauses = []
 
   for r in range(N):
     for c in range(N):
       # numbers 1 to N for every box
-      var_ls = [map_to_var(r, c, v, N) for v in range(1, N + 1)]
-      clauses.extend(one_value_per_cell_helper(var_ls))
+      base = map_to_var(r, c, 0, N)
+      clauses.extend(one_value_per_cell_helper(range(base + 1, base + N + 1)))
 
   return clauses
 
@@ -110,8 +119,8 @@ def row_constraint(N):
   for r in range(N):
     for v in range(1, N + 1):
       # all the column options
-      var_ls = [map_to_var(r, c, v, N) for c in range(N)]
-      clauses.extend(one_value_per_cell_helper(var_ls))
+      first = map_to_var(r, 0, v, N)
+      clauses.extend(one_value_per_cell_helper(range(first, first + N * N, N)))
 
   return clauses
 
@@ -126,8 +135,8 @@ def col_constraint(N):
   for c in range(N):
     for v in range(1, N + 1):
       # all the row options
-      var_ls = [map_to_var(r, c, v, N) for r in range(N)]
-      clauses.extend(one_value_per_cell_helper(var_ls))
+      first = map_to_var(0, c, v, N)
+      clauses.extend(one_value_per_cell_helper(range(first, N ** 3 + 1, N * N)))
 
   return clauses
 
@@ -147,12 +156,10 @@ def box_constraint(N):
       # create value options for the box
       for v in range(1, N + 1):
         var_ls = []
-        for inner_r in range(B):
-          for inner_c in range(B):
-            # grid row and column
-            r = outer_r + inner_r
-            c = outer_c + inner_c
-            var_ls.append(map_to_var(r, c, v, N))
+        for r in range(outer_r, outer_r + B):
+          # one row of the box is a range over the columns
+          first = map_to_var(r, outer_c, v, N)
+          var_ls.extend(range(first, first + B * N, N))
         clauses.extend(one_value_per_cell_helper(var_ls))
   return clauses
 
@@ -163,19 +170,19 @@ def non_consecutive(N):
   For each cell v, adjacent cells cannot be v+1
   """
   clauses = []
+  NN = N * N
 
   for r in range(N):
     for c in range(N):
-      # check right and down neighbors
-      n_right = (r, c + 1)
-      n_down = (r + 1, c)
-      for (r2, c2) in (n_down, n_right):
-        # check if neighbours are still on grid
-        if 0 <= r2 < N and 0 <= c2 < N:
-          for v in range(1, N):
+      base = r * NN + c * N
+      # check down and right neighbours, they are N*N and N variables further
+      for on_grid, step in ((r + 1 < N, NN), (c + 1 < N, N)):
+        if on_grid:
+          # x is var(r, c, v), so x + 1 is value v + 1 in the same cell
+          for x in range(base + 1, base + N):
             # non consecutive
-            clauses.append([-map_to_var(r, c, v, N), -map_to_var(r2, c2, v + 1, N)])
-            clauses.append([-map_to_var(r, c, v + 1, N), -map_to_var(r2, c2, v, N)])
+            clauses.append([-x, -(x + step + 1)])
+            clauses.append([-(x + 1), -(x + step)])
 
   return clauses
 
@@ -199,6 +206,23 @@ def clues(grid, N):
 # Conjunction
 # --------------------
 
+@lru_cache(maxsize=4)
+def structural_cnf(N):
+  """
+  Constraints 1-5 for an N x N grid, cached per N.
+  Clauses are tuples so the cached copy can not be changed by a caller.
+  """
+  clauses = []
+
+  clauses += one_value_per_cel(N)
+  clauses += row_constraint(N)
+  clauses += col_constraint(N)
+  clauses += box_constraint(N)
+  clauses += non_consecutive(N)
+
+  return tuple(map(tuple, clauses))
+
+
 def to_cnf(input_path: str) -> Tuple[Iterable[Iterable[int]], int]:
   """
   Read puzzle from input_path and return (clauses, num_vars).
@@ -209,14 +233,10 @@ def to_cnf(input_path: str) -> Tuple[Iterable[Iterable[int]], int]:
 
   grid = read_text(input_path)
   N = len(grid)
-  clauses = []
   num_vars = N ** 3
 
-  clauses += one_value_per_cel(N)
-  clauses += row_constraint(N)
-  clauses += col_constraint(N)
-  clauses += box_constraint(N)
-  clauses += non_consecutive(N)
+  # constraints 1-5 only depend on N, only the clues differ per puzzle
+  clauses = list(structural_cnf(N))
   clauses += clues(grid, N)
 
   return (clauses, num_vars)
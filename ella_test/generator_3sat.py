@@ -2,18 +2,22 @@ import random
 
 
 def generate_random_3sat(num_vars, num_clauses, filename):
-    with open(filename, "w") as f:
-        # Header
-        f.write(f"p cnf {num_vars} {num_clauses}\n")
+    variables = range(1, num_vars + 1)
+    lines = [f"p cnf {num_vars} {num_clauses}\n"]
+
+    for _ in range(num_clauses):
+        # three distinct variables, no retry loop needed
+        clause = random.sample(variables, 3)
+        # one random bit per literal for the sign
+        signs = random.getrandbits(3)
+        for i in range(3):
+            if signs >> i & 1:
+                clause[i] = -clause[i]
+        lines.append(f"{clause[0]} {clause[1]} {clause[2]} 0\n")
 
-        for _ in range(num_clauses):
-            clause = set()
-            while len(clause) < 3:
-                var = random.randint(1, num_vars)
-                lit = var if random.choice([True, False]) else -var
-                clause.add(lit)
-            # Write clause
-            f.write(" ".join(str(l) for l in clause) + " 0\n")
+    # Header and clauses in a single write
+    with open(filename, "w") as f:
+        f.writelines(lines)
 
 
 generate_random_3sat(num_vars=50, num_clauses=210, filename="random_3sat.cnf")
@@ -20,12 +20,119 @@ from typing import Tuple, Iterable
 from encoder import to_cnf
 from encoder import read_dimacs
 from solver_random import solve_cnf_random
-from solver import solve_cnf_dlcs
+from solver import solve_cnf_dlcs, convert_clauses
+from solver import unit_clause_rule, pure_literal_rule
 from solver_jw import solve_cnf_jw
 from solver_mom import solve_cnf_mom
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
 import pathlib
+import queue
 import re
+import time
+
+
+SOLVERS = {
+    "random": solve_cnf_random,
+    "dlcs": solve_cnf_dlcs,
+    "jw": solve_cnf_jw,
+    "mom": solve_cnf_mom,
+}
+
+
+def load_instance(path, cnf):
+    """
+    Read one file and simplify it once at the root with the unit clause and
+    pure literal rules, so every solver starts from the same reduced formula
+    instead of redoing that work itself.
+    Returns (clauses, num_vars, forced, runtime): the reduced clauses, the
+    assignment the rules forced, which the solvers start from, and the time
+    the simplification took.
+    """
+    if cnf:
+        clauses, num_vars = read_dimacs(path)
+    else:
+        clauses, num_vars = to_cnf(path)
+
+    t0 = time.perf_counter()
+    forced = {}
+    reduced, forced, conflict = unit_clause_rule(convert_clauses(clauses), forced)
+    # a root conflict is left for the solvers to find, they report it anyway
+    if conflict:
+        return clauses, num_vars, {}, time.perf_counter() - t0
+    reduced, forced = pure_literal_rule(reduced, forced)
+    runtime = time.perf_counter() - t0
+    return [sorted(c) for c in reduced], num_vars, forced, runtime
+
+
+def run_solver(task):
+    """
+    Solve one (instance, solver name) task in a worker process.
+    Returns (status, stats).
+    """
+    (clauses, num_vars, forced, _), name = task
+    status, _, stats = SOLVERS[name](clauses, num_vars, assignment=forced)
+    return status, stats
+
+
+def run_portfolio_solver(task, stop_event, result_queue):
+    """
+    Portfolio worker: solve one task until done or until another solver
+    has set `stop_event`. Puts (name, status, stats) on `result_queue`,
+    with status "ERROR" if the solver failed.
+    """
+    (clauses, num_vars, forced, _), name = task
+    try:
+        status, _, stats = SOLVERS[name](
+            clauses, num_vars, should_stop=stop_event.is_set, assignment=forced
+        )
+    except Exception as error:
+        # report the failure, otherwise the parent waits for this worker forever
+        result_queue.put((name, "ERROR", f"{name}: {error!r}\n"))
+        return
+    # any verdict is final for the instance, so stop the others
+    if status != "ABORTED":
+        stop_event.set()
+    result_queue.put((name, status, stats))
+
+
+def run_portfolio(instance):
+    """
+    Run all solvers on one loaded instance at once; the first one to finish
+    stops the rest. Returns a (status, stats) row per solver, aborted and
+    failed ones included.
+    """
+    stop_event = multiprocessing.Event()
+    result_queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=run_portfolio_solver,
+            args=((instance, name), stop_event, result_queue),
+        )
+        for name in SOLVERS
+    ]
+    for worker in workers:
+        worker.start()
+
+    # read the queue before joining, a worker with queued data does not exit
+    results = {}
+    while len(results) < len(workers):
+        try:
+            name, status, stats = result_queue.get(timeout=1)
+        except queue.Empty:
+            # a worker killed outright never puts its result
+            if not any(worker.is_alive() for worker in workers) and result_queue.empty():
+                break
+            continue
+        results[name] = (status, stats)
+    for worker in workers:
+        worker.join()
+
+    return [
+        results.get(name) or ("ERROR", f"{name}: exited with code {worker.exitcode}\n")
+        for name, worker in zip(SOLVERS, workers)
+    ]
 
 
 def get_case_id(path: str) -> int:
@@ -51,6 +158,19 @@ def parse_args():
         default="out.txt",
         help="Output path",
     )
+    p.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes",
+    )
+    p.add_argument(
+        "--portfolio",
+        dest="portfolio",
+        action="store_true",
+        help="Race the solvers per file and stop the rest at the first verdict",
+    )
     return p.parse_args()
 
 
@@ -77,73 +197,97 @@ def main():
         input_paths.append(args.inp)
 
     input_paths.sort(key=get_case_id)
-    # Run each file
-    for path in input_paths:
-        string = path + "\n"
-
-        if args.cnf:
-            clauses, num_vars = read_dimacs(path)
-        else:
-            clauses, num_vars = to_cnf(path)
-
-        # ---- RANDOM ----
-        status, _, stats = solve_cnf_random(clauses, num_vars)
-        string += status + "\n" + stats + "\n"
-
-        # ---- DLCS ----
-        status, _, stats = solve_cnf_dlcs(clauses, num_vars)
-        string += status + "\n" + stats + "\n"
 
-        # ---- JW ----
-        status, _, stats = solve_cnf_jw(clauses, num_vars)
-        string += status + "\n" + stats + "\n"
-
-        # ---- MOM ----
-        status, _, stats = solve_cnf_mom(clauses, num_vars)
-        string += status + "\n" + stats + "\n"
-
-        # Optional separator
-        string += "-" * 40 + "\n"
-
-        # Write to output file and std out
-        print(string)
-        with output_file.open("a") as f:
+    if args.portfolio:
+        # all solvers race on one file at a time, first verdict wins
+        instances = (load_instance(path, args.cnf) for path in input_paths)
+        reports = (
+            (path, instance[3], run_portfolio(instance))
+            for path, instance in zip(input_paths, instances)
+        )
+        write_results(reports, output_file)
+        return
+
+    # every (file, solver) pair is independent, so run them in a process
+    # pool; results come back in task order
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        # each file is read and simplified once, then shared by all solvers
+        instances = list(
+            executor.map(load_instance, input_paths, [args.cnf] * len(input_paths))
+        )
+        tasks = [(instance, name) for instance in instances for name in SOLVERS]
+        results = executor.map(run_solver, tasks)
+        reports = (
+            (path, instance[3], [next(results) for _ in SOLVERS])
+            for path, instance in zip(input_paths, instances)
+        )
+        write_results(reports, output_file)
+
+
+def write_results(reports, output_file):
+    """
+    Report each (path, preprocessing runtime, rows) entry of `reports`,
+    where rows holds the (status, stats) of every solver on that file.
+    """
+    # open the output once, and build each report as a list of parts
+    with output_file.open("a") as f:
+        # Run each file
+        for path, runtime, rows in reports:
+            parts = [path, "\n", f"Runtime preprocessing: {runtime}\n"]
+
+            # ---- RANDOM, DLCS, JW, MOM ----
+            for status, stats in rows:
+                parts += (status, "\n", stats, "\n")
+
+            # Optional separator
+            parts.append("-" * 40 + "\n")
+
+            # Write to output file and std out
+            string = "".join(parts)
+            print(string)
             f.write(string)
+            # keep finished files on disk if the run is interrupted
+            f.flush()
 
 
 def parse_dimacs(input_path: str) -> Tuple[Iterable[Iterable[int]], int]:
-    close = False
+    # read the whole file at once and split it into tokens in one go,
+    # instead of going line by line
     if isinstance(input_path, str):
-        file = open(input_path, "r")
-        close = True
+        with open(input_path, "rb") as file:
+            data = file.read()
     else:
-        file = input_path
-
-    line = file.readline()
+        data = input_path.read()
+        if isinstance(data, str):
+            data = data.encode()
 
-    components = line.strip().split(" ")
+    tokens = data.split()
 
-    if len(components) != 4 or components[0] != "p" or components[1] != "cnf":
+    if len(tokens) < 4 or tokens[0] != b"p" or tokens[1] != b"cnf":
         print(
             "Wrong file format! Expected first line to be 'p cnf NUM_VARS NUM_CLAUSES"
         )
         exit(1)
 
-    num_vars = int(components[2])
-    num_clauses = int(components[3])
+    num_vars = int(tokens[2])
+    num_clauses = int(tokens[3])
 
-    clauses = []
+    numbers = list(map(int, tokens[4:]))
 
-    line = file.readline()
-    while line:
-        numbers = [int(x) for x in line.strip().split(" ")]
+    clauses = []
 
-        if numbers[-1] != 0:
+    # every 0 ends a clause, list.index finds them without a python loop
+    start = 0
+    while start < len(numbers):
+        try:
+            end = numbers.index(0, start)
+        except ValueError:
             print("Wrong format! Clause lines must be terminated with a 0")
+            end = len(numbers)
 
-        clauses.append(numbers[:-1])
+        clauses.append(numbers[start:end])
 
-        line = file.readline()
+        start = end + 1
 
     return clauses, num_vars
 
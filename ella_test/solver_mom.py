@@ -6,12 +6,88 @@ THIS is the file to edit.
 Implement: solve_cnf(clauses) -> (status, model_or_None)"""
 
 from typing import Iterable, List, Tuple, Set, Dict
+from collections import Counter, deque
+from array import array
 import time
 
 
-def convert_clauses(clauses):
-    """Convert clauses to a list-of-sets"""
-    return [set(c) for c in clauses]
+def build_db(clauses, num_vars):
+    """
+    Flatten the clauses into one int array and build the occurrence lists.
+
+    - clause i lives in lits[clause_starts[i]:clause_starts[i + 1]]
+    - occ[lit] holds the ids of the clauses containing lit; negative
+      literals index from the back of the list, so no offset is needed
+    """
+    clause_starts = array("i", [0])
+    lits = array("i")
+    occ = [[] for _ in range(2 * num_vars + 1)]
+
+    for ci, c in enumerate(clauses):
+        # drop duplicate literals, they would be counted twice; keep the
+        # literals in set order, like the other solvers' clause sets, since
+        # split breaks ties by first occurrence and the reported counters
+        # are compared between the solvers
+        c = list(set(c))
+        lits.extend(c)
+        clause_starts.append(len(lits))
+        for lit in c:
+            occ[lit].append(ci)
+
+    return clause_starts, lits, occ
+
+
+class State:
+    """
+    Search state shared by every node of the DPLL tree.
+
+    - assign[var]: 0 = unset, 1 = True, -1 = False
+    - trail: the literals made true, in order, so they can be undone
+    - clause_size[ci]: the number of literals of clause ci that are not false
+    - clause_sat[ci]: the number of literals of clause ci that are true
+    - unit_queue: literals waiting to be assigned by the unit clause rule
+    - lit_count[lit]: the number of open clauses lit occurs in
+    - pure_queue: literals that may have become pure, checked again on use
+    - by_size[n]: the open clauses with n literals left
+    """
+
+    def __init__(self, db, num_vars):
+        clause_starts, lits, _ = db
+        num_clauses = len(clause_starts) - 1
+
+        self.assign = array("b", bytes(num_vars + 1))
+        self.trail = []
+        self.clause_size = array(
+            "i", [clause_starts[ci + 1] - clause_starts[ci] for ci in range(num_clauses)]
+        )
+        self.clause_sat = array("i", [0]) * num_clauses
+        self.unit_queue = deque()
+        self.lit_count = array("i", [0]) * (2 * num_vars + 1)
+        for lit in lits:
+            self.lit_count[lit] += 1
+        # literals that are pure from the start
+        self.pure_queue = [
+            lit
+            for var in range(1, num_vars + 1)
+            for lit in (var, -var)
+            if self.lit_count[lit] and not self.lit_count[-lit]
+        ]
+        self.by_size = [set() for _ in range(max(self.clause_size, default=0) + 1)]
+        for ci in range(num_clauses):
+            self.by_size[self.clause_size[ci]].add(ci)
+
+
+def remove_satisfied(db, state):
+    """
+    Drop the clauses satisfied at the root from the occurrence lists.
+    Root assignments are never undone, so these clauses can never reopen
+    and no later pass has to step over them.
+    """
+    occ = db[2]
+    clause_sat = state.clause_sat
+
+    for ids in occ:
+        ids[:] = [ci for ci in ids if not clause_sat[ci]]
 
 
 # --------------------
@@ -19,112 +95,113 @@ def convert_clauses(clauses):
 # --------------------
 
 
-def unit_clause_rule(clauses, assignment):
-    clauses = clauses[:]
-    assignment = dict(assignment)
+def unit_clause_rule(db, state):
+    """
+    Assign the queued unit literals until the queue is empty.
+    Only the clauses in the occurrence lists of each literal are visited.
+    Returns True on conflict.
 
-    while True:
-        # find unit clauses
-        unit_lits = []
-        for c in clauses:
-            if len(c) == 1:
-                unit_lits.append(next(iter(c)))
-
-        if not unit_lits:
-            break
-
-        for lit in unit_lits:
-            # check boolean of literal
-            var = abs(lit)
-            val = lit > 0
-
-            # check for conflict
-            if var in assignment:
-                if assignment[var] != val:
-                    return clauses, assignment, True
-                else:
-                    continue
-
-            # put variable in assignment
-            assignment[var] = val
-
-            # simplify clauses:
-            new_clauses = []
-            # loop through clauses and check if the contain the unit lit
-            for c in clauses:
-                # unit clause satisfied, so remove
-                if lit in c:
-                    continue
-                # literal falsified, so remove
-                if -lit in c:
-                    new_c = set(c)
-                    new_c.remove(-lit)
-                    # empty clause, so conflict
-                    if len(new_c) == 0:
-                        return clauses, assignment, True
-                    new_clauses.append(new_c)
-                # unit literal not in clause
-                else:
-                    new_clauses.append(c)
-            clauses = new_clauses
-
-    return clauses, assignment, False
-
-
-def pure_literal_rule(clauses, assignment):
-    clauses = clauses[:]
-    assignment = dict(assignment)
+    This is the hot loop of the solver, so everything it touches is bound
+    to a local name and the assignment is written out inline.
+    """
+    clause_starts, lits, occ = db
+    assign, trail = state.assign, state.trail
+    clause_size, clause_sat = state.clause_size, state.clause_sat
+    unit_queue, pure_queue = state.unit_queue, state.pure_queue
+    lit_count, by_size = state.lit_count, state.by_size
+    popleft = unit_queue.popleft
+    push = unit_queue.append
+
+    while unit_queue:
+        lit = popleft()
+        var = lit if lit > 0 else -lit
+        val = assign[var]
+        if val:
+            # already true, nothing to do
+            if (val == 1) == (lit > 0):
+                continue
+            # already false, so conflict
+            unit_queue.clear()
+            return True
 
-    while True:
-        pos_occ: Dict[int, int] = {}
-        neg_occ: Dict[int, int] = {}
-
-        for c in clauses:
-            for lit in c:
-                var = abs(lit)
-                # already assigned variable, so skip
-                if var in assignment:
-                    continue
-                # add positive literal to the dict
-                if lit > 0:
-                    pos_occ[var] = pos_occ.get(var, 0) + 1
-                # add negative literal to the dict
-                else:
-                    neg_occ[var] = neg_occ.get(var, 0) + 1
-
-        pure_vars = []
-        for var in set(list(pos_occ.keys()) + list(neg_occ.keys())):
-            # already assigned, so continue
-            if var in assignment:
+        assign[var] = 1 if lit > 0 else -1
+        trail.append(lit)
+
+        # clauses containing lit are satisfied
+        for ci in occ[lit]:
+            if clause_sat[ci]:
+                clause_sat[ci] += 1
                 continue
-            p = pos_occ.get(var, 0)
-            n = neg_occ.get(var, 0)
-            # add true pure variable
-            if p > 0 and n == 0:
-                pure_vars.append((var, True))
-            # add false pure variable
-            elif n > 0 and p == 0:
-                pure_vars.append((var, False))
-
-        if not pure_vars:
-            break
-
-        # assign and simplify
-        for var, val in pure_vars:
-            # assign pure literal
-            assignment[var] = val
-            # update the clauses
-            lit = var if val else -var
-            new_clauses = []
-            for c in clauses:
-                # clause is satisfied, so skip
-                if lit in c:
-                    continue
-                # clause does not have pure literal so don't change
-                new_clauses.append(c)
-            clauses = new_clauses
-
-    return clauses, assignment
+            clause_sat[ci] = 1
+            by_size[clause_size[ci]].remove(ci)
+            # newly satisfied clause: its literals occur in one open clause
+            # less, and a literal whose count hits zero makes its negation pure
+            for other in lits[clause_starts[ci] : clause_starts[ci + 1]]:
+                count = lit_count[other] - 1
+                lit_count[other] = count
+                if (
+                    not count
+                    and lit_count[-other]
+                    and not assign[other if other > 0 else -other]
+                ):
+                    pure_queue.append(-other)
+
+        # clauses containing -lit lose a literal; the counters are always
+        # updated completely so backtrack can undo them
+        conflict = False
+        for ci in occ[-lit]:
+            size = clause_size[ci] - 1
+            clause_size[ci] = size
+            if clause_sat[ci]:
+                continue
+            # move the clause one bucket down
+            by_size[size + 1].remove(ci)
+            by_size[size].add(ci)
+            if size > 1:
+                continue
+            # empty clause, so conflict
+            if size == 0:
+                conflict = True
+                continue
+            # unit clause, queue its last unassigned literal
+            for k in range(clause_starts[ci], clause_starts[ci + 1]):
+                other = lits[k]
+                if not assign[other if other > 0 else -other]:
+                    push(other)
+                    break
+        if conflict:
+            unit_queue.clear()
+            return True
+
+    return False
+
+
+def pure_literal_rule(db, state):
+    """
+    Assign the pure literals found by the unit clause rule.
+    Returns the number of literals assigned.
+
+    lit_count[lit] is the number of open clauses containing lit. The unit
+    clause rule queues a literal as soon as the count of its negation drops
+    to zero, so no clause has to be scanned here.
+    """
+    assign, unit_queue = state.assign, state.unit_queue
+    lit_count, pure_queue = state.lit_count, state.pure_queue
+
+    count = 0
+    while pure_queue:
+        lit = pure_queue.pop()
+        # the queue can hold stale entries, so check again
+        if assign[abs(lit)] or lit_count[-lit] or not lit_count[lit]:
+            continue
+        unit_queue.append(lit)
+        count += 1
+
+    # a pure literal only satisfies clauses, so this never conflicts
+    if count:
+        unit_clause_rule(db, state)
+
+    return count
 
 
 # --------------------
@@ -132,152 +209,185 @@ def pure_literal_rule(clauses, assignment):
 # --------------------
 
 
-def split(clauses, assignment, num_vars):
+def split(db, state):
     """
-    Chosen heuristic for splitting: Jeroslow Wang Two Sided
+    Chosen heuristic for splitting: MOM
+    Maximum Occurrences in clauses of Minimum size, on the clauses that
+    are not satisfied yet.
+
+    by_size[n] holds the open clauses with n literals left, so only the
+    shortest ones are visited.
     """
-    # filter out clauses that contain only unassigned variables
-    unassigned_clauses = [
-        c for c in clauses if not all(abs(l) in assignment for l in c)
-    ]
-    if not unassigned_clauses:
-        return None, True
+    clause_starts, lits, _ = db
+    assign, by_size = state.assign, state.by_size
 
-    # find the minimum clause length
-    min_len = min(len(c) for c in unassigned_clauses)
+    # find the minimum clause length, from the first non-empty bucket
+    shortest = next((b for b in by_size if b), None)
+    if shortest is None:
+        return None, True
 
-    # collect only the shortest clauses
-    min_clauses = [c for c in unassigned_clauses if len(c) == min_len]
+    # count the unassigned literals of the shortest clauses in one pass;
+    # in clause order, as a set's order would change the tie-break below
+    lit_counts = Counter(
+        lit
+        for ci in sorted(shortest)
+        for lit in lits[clause_starts[ci] : clause_starts[ci + 1]]
+        if not assign[abs(lit)]
+    )
 
-    # count literal occurrences
+    # score per variable, in order of first occurrence
     scores = {}
-    for c in min_clauses:
-        for lit in c:
-            var = abs(lit)
-            if var in assignment:
-                continue
-            scores[var] = scores.get(var, 0) + 1
+    for lit in lit_counts:
+        var = abs(lit)
+        if var not in scores:
+            scores[var] = lit_counts[var] + lit_counts[-var]
 
     # pick variable with maximum score
     best_var = max(scores, key=scores.get)
-    # choose preferred polarity, so whichever appears more often
-    pol_score = 0
-    for c in min_clauses:
-        if best_var in c:
-            pol_score += 1
-        if -best_var in c:
-            pol_score -= 1
-
     # we prefer polarity with highest occurrence
-    best_pref = pol_score >= 0
+    best_pref = lit_counts[best_var] >= lit_counts[-best_var]
 
     return best_var, best_pref
 
 
 # --------------------
-# Simplify
+# DPLL
 # --------------------
-def check_empty_clause(clauses):
-    return any(len(c) == 0 for c in clauses)
 
 
-def simplify_after_assignment(clauses, lit):
+def backtrack(db, state, mark):
+    """Undo every assignment made after trail position `mark`."""
+    clause_starts, lits, occ = db
+    assign, trail = state.assign, state.trail
+    clause_size, clause_sat = state.clause_size, state.clause_sat
+    lit_count, pure_queue, by_size = state.lit_count, state.pure_queue, state.by_size
+
+    # the pure literals at `mark` were all assigned before the split
+    pure_queue.clear()
+    while len(trail) > mark:
+        lit = trail.pop()
+        assign[abs(lit)] = 0
+        # undo in the reverse order of unit_clause_rule, sizes first
+        for ci in occ[-lit]:
+            size = clause_size[ci]
+            clause_size[ci] = size + 1
+            if not clause_sat[ci]:
+                by_size[size].remove(ci)
+                by_size[size + 1].add(ci)
+        for ci in occ[lit]:
+            clause_sat[ci] -= 1
+            # clause open again, count its literals back in
+            if not clause_sat[ci]:
+                by_size[clause_size[ci]].add(ci)
+                for other in lits[clause_starts[ci] : clause_starts[ci + 1]]:
+                    lit_count[other] += 1
+
+
+class SolverAborted(Exception):
+    """Raised inside dpll when the caller asked the search to stop."""
+
+
+def dpll(db, state, counters, should_stop=None):
     """
-    Given assignment of literal `lit` to True, remove satisfied clauses and remove -lit from other clauses.
+    Iterative DPLL on a shared assignment, with an explicit decision stack
+    instead of recursion. Backtracking only pops the trail.
     """
-    new_clauses = []
-    for c in clauses:
-        # clause satisfied, so skip
-        if lit in c:
-            continue
-        # remove the negations of the literal from the clause
-        if -lit in c:
-            new_c = set(c)
-            new_c.remove(-lit)
-            new_clauses.append(new_c)
-        # clause not affected by literal
-        else:
-            new_clauses.append(c)
-    return new_clauses
-
-
-# --------------------
-# DPLL
-# --------------------
-
+    trail, unit_queue = state.trail, state.unit_queue
+    # one entry per split: (trail mark, literal of the untried branch or 0)
+    decisions = []
 
-def dpll(clauses, assignment, num_vars, counters):
-    """Recursive DPLL."""
-    counters["calls"] += 1
-    # 1. Unit clause rule
-    clauses, assignment, conflict = unit_clause_rule(clauses, assignment)
-    if conflict:
-        return False, {}, counters
-
-    # 2. Pure literal elimination
-    clauses, assignment = pure_literal_rule(clauses, assignment)
-
-    # 3. Check base cases
-    if not clauses:
-        # no clauses -> satisfied
-        return True, assignment, counters
-    if check_empty_clause(clauses):
-        return False, {}, counters
-
-    # 4. Choose variable to split (heuristic)
-    var, pref_val = split(clauses, assignment, num_vars)
-    # if all variables already assigned, but not all clauses satisfied
-    if var is None:
-        return False, {}, counters
-
-    # 5. SPlit: try preferred polarity first
-    counters["splits"] += 1
-    for try_val in (pref_val, not pref_val):
-        lit = var if try_val else -var
-
-        new_assignment = dict(assignment)
-        new_assignment[var] = try_val
-        new_clauses = simplify_after_assignment(clauses, lit)
-        # if empty clause, not satisfied,backtrack, try oher value
-        if any(len(c) == 0 for c in new_clauses):
+    while True:
+        # every pass of this loop is one node of the search tree
+        counters["calls"] += 1
+        # check for a stop request every 1024 calls
+        if should_stop is not None and counters["calls"] & 1023 == 0 and should_stop():
+            raise SolverAborted
+
+        # 1. Unit clause rule, then pure literal elimination until neither fires
+        conflict = False
+        while True:
+            if unit_clause_rule(db, state):
+                conflict = True
+                break
+            if not pure_literal_rule(db, state):
+                break
+
+        if not conflict:
+            # satisfied at the root means satisfied for good
+            if not decisions:
+                remove_satisfied(db, state)
+
+            # 2. Choose variable to split (heuristic)
+            var, pref_val = split(db, state)
+            # no unsatisfied clauses left -> satisfied
+            if var is None:
+                return True
+
+            # 3. Split: try preferred polarity first
+            counters["splits"] += 1
+            lit = var if pref_val else -var
+            decisions.append((len(trail), -lit))
+            unit_queue.append(lit)
             continue
-        # recursion, move to next level in our tree
-        sat, final_assignment, counters = dpll(
-            new_clauses, new_assignment, num_vars, counters
-        )
-        if not sat:
-            counters["backtracks"] += 1
-        if sat:
-            return True, final_assignment, counters
 
-    return False, {}, counters
+        # 4. Backtrack to the latest split with an untried branch
+        while True:
+            if not decisions:
+                return False
+            mark, other = decisions.pop()
+            counters["backtracks"] += 1
+            backtrack(db, state, mark)
+            if other:
+                decisions.append((mark, 0))
+                unit_queue.append(other)
+                break
 
 
-def build_model(assignment, num_vars):
+def build_model(assign, num_vars):
     """
     Build a full DIMACS-style model
     Unassigned variables are set to False
     """
-    model = []
-    for v in range(1, num_vars + 1):
-        val = assignment.get(v, False)
-        model.append(v if val else -v)
-    return model
+    return [v if assign[v] == 1 else -v for v in range(1, num_vars + 1)]
 
 
-def solve_cnf_mom(clauses, num_vars, log=False):
+def solve_cnf_mom(clauses, num_vars, log=False, should_stop=None, assignment=None):
     """
     Solve a CNF formula using the Maximum Occurrences in clauses of Minimum Size (MOM) heuristic.
     Return:
       ("SAT", model)  where model is a list of ints (DIMACS-style), or
       ("UNSAT", None)
+      ("ABORTED", None)  if should_stop() returned True during the search
+    `assignment` is an optional starting assignment, e.g. the variables
+    forced by simplifying the formula at the root. It is propagated like
+    unit clauses, and the model includes it.
     """
 
-    init_counters = {"splits": 0, "backtracks": 0, "calls": 0}
+    counters = {"splits": 0, "backtracks": 0, "calls": 0}
+
+    db = build_db(clauses, num_vars)
+    clause_starts, lits, _ = db
+    num_clauses = len(clause_starts) - 1
+    state = State(db, num_vars)
+    clause_size = state.clause_size
 
-    clause_sets = convert_clauses(clauses)
     t0 = time.perf_counter()
-    sat, assignment, counters = dpll(clause_sets, {}, num_vars, init_counters)
+    # empty clause, so unsatisfiable
+    status = "SAT" if all(clause_size) else "UNSAT"
+    if status == "SAT":
+        # the starting assignment and the unit clauses of the input start the
+        # propagation; the starting literals are assigned at the root, so
+        # they are never undone
+        state.unit_queue.extend(
+            var if val else -var for var, val in (assignment or {}).items()
+        )
+        for ci in range(num_clauses):
+            if clause_size[ci] == 1:
+                state.unit_queue.append(lits[clause_starts[ci]])
+        try:
+            status = "SAT" if dpll(db, state, counters, should_stop) else "UNSAT"
+        except SolverAborted:
+            status = "ABORTED"
     t1 = time.perf_counter()
     runtime = t1 - t0
 
@@ -291,11 +401,11 @@ def solve_cnf_mom(clauses, num_vars, log=False):
     if log:
         print(string)
 
-    if sat:
-        model = build_model(assignment, num_vars)
+    if status == "SAT":
+        model = build_model(state.assign, num_vars)
         return "SAT", model, string
     else:
-        return "UNSAT", None, string
+        return status, None, string
 
 
 # python main.py --in puzzle.txt
@@ -6,6 +6,7 @@ THIS is the file to edit.
 Implement: solve_cnf(clauses) -> (status, model_or_None)"""
 
 from typing import Iterable, List, Tuple, Set, Dict
+from collections import Counter
 import time
 import random
 
@@ -21,8 +22,8 @@ def convert_clauses(clauses):
 
 
 def unit_clause_rule(clauses, assignment):
+    # assignment is extended in place, the caller undoes it on backtrack
     clauses = clauses[:]
-    assignment = dict(assignment)
 
     while True:
         # find unit clauses
@@ -73,57 +74,32 @@ def unit_clause_rule(clauses, assignment):
 
 
 def pure_literal_rule(clauses, assignment):
+    # assignment is extended in place, the caller undoes it on backtrack
     clauses = clauses[:]
-    assignment = dict(assignment)
 
     while True:
-        pos_occ: Dict[int, int] = {}
-        neg_occ: Dict[int, int] = {}
+        # count the unassigned literals of both polarities in one go
+        pos_occ = Counter(
+            lit for c in clauses for lit in c if lit > 0 and lit not in assignment
+        )
+        neg_occ = Counter(
+            -lit for c in clauses for lit in c if lit < 0 and -lit not in assignment
+        )
 
-        for c in clauses:
-            for lit in c:
-                var = abs(lit)
-                # already assigned variable, so skip
-                if var in assignment:
-                    continue
-                # add positive literal to the dict
-                if lit > 0:
-                    pos_occ[var] = pos_occ.get(var, 0) + 1
-                # add negative literal to the dict
-                else:
-                    neg_occ[var] = neg_occ.get(var, 0) + 1
+        # pure variables occur in one polarity only
+        pure_lits = list(pos_occ.keys() - neg_occ.keys())
+        pure_lits += [-var for var in neg_occ.keys() - pos_occ.keys()]
 
-        pure_vars = []
-        for var in set(list(pos_occ.keys()) + list(neg_occ.keys())):
-            # already assigned, so continue
-            if var in assignment:
-                continue
-            p = pos_occ.get(var, 0)
-            n = neg_occ.get(var, 0)
-            # add true pure variable
-            if p > 0 and n == 0:
-                pure_vars.append((var, True))
-            # add false pure variable
-            elif n > 0 and p == 0:
-                pure_vars.append((var, False))
-
-        if not pure_vars:
+        if not pure_lits:
             break
 
-        # assign and simplify
-        for var, val in pure_vars:
-            # assign pure literal
-            assignment[var] = val
-            # update the clauses
-            lit = var if val else -var
-            new_clauses = []
-            for c in clauses:
-                # clause is satisfied, so skip
-                if lit in c:
-                    continue
-                # clause does not have pure literal so don't change
-                new_clauses.append(c)
-            clauses = new_clauses
+        # assign the pure literals
+        for lit in pure_lits:
+            assignment[abs(lit)] = lit > 0
+
+        # and drop the clauses they satisfy in one pass
+        pure_set = set(pure_lits)
+        clauses = [c for c in clauses if pure_set.isdisjoint(c)]
 
     return clauses, assignment
 
@@ -178,55 +154,96 @@ def simplify_after_assignment(clauses, lit):
     return new_clauses
 
 
+def simplify_by_assignment(clauses, assignment):
+    """
+    Apply a whole assignment in one pass: remove the satisfied clauses and
+    the false literals from the other clauses.
+    """
+    true_lits = {var if val else -var for var, val in assignment.items()}
+    new_clauses = []
+    for c in clauses:
+        # clause satisfied, so skip
+        if not true_lits.isdisjoint(c):
+            continue
+        # remove the false literals from the clause
+        if any(-lit in true_lits for lit in c):
+            c = {lit for lit in c if -lit not in true_lits}
+        new_clauses.append(c)
+    return new_clauses
+
+
 # --------------------
 # DPLL
 # --------------------
 
 
-def dpll(clauses, assignment, num_vars, counters):
-    """Recursive DPLL."""
-    counters["calls"] += 1
-    # 1. Unit clause rule
-    clauses, assignment, conflict = unit_clause_rule(clauses, assignment)
-    if conflict:
-        return False, {}, counters
-
-    # 2. Pure literal elimination
-    clauses, assignment = pure_literal_rule(clauses, assignment)
-
-    # 3. Check base cases
-    if not clauses:
-        # no clauses -> satisfied
-        return True, assignment, counters
-    if check_empty_clause(clauses):
-        return False, {}, counters
-
-    # 4. Choose variable to split (heuristic)
-    var, pref_val = split(clauses, assignment, num_vars)
-    # if all variables already assigned, but not all clauses satisfied
-    if var is None:
-        return False, {}, counters
-
-    # 5. SPlit: try preferred polarity first
-    counters["splits"] += 1
-    for try_val in (pref_val, not pref_val):
-        lit = var if try_val else -var
-
-        new_assignment = dict(assignment)
-        new_assignment[var] = try_val
-        new_clauses = simplify_after_assignment(clauses, lit)
-        # if empty clause, not satisfied,backtrack, try oher value
-        if any(len(c) == 0 for c in new_clauses):
+class SolverAborted(Exception):
+    """Raised inside dpll when the caller asked the search to stop."""
+
+
+def dpll(clauses, assignment, num_vars, counters, should_stop=None):
+    """
+    DPLL with an explicit stack instead of recursion, so deep search trees
+    do not hit the recursion limit. Each entry is a node still to visit:
+    its parent's clauses, the branch literal to apply to them (0 for the
+    root), its depth and the size of the assignment at its parent.
+
+    All nodes share one assignment dict. Variables are only ever added to
+    it, and dicts keep insertion order, so backtracking to a node just pops
+    the newest entries until the dict is back at the parent's size.
+    """
+    first_call = counters["calls"]
+    stack = [(clauses, 0, 0, len(assignment))]
+
+    while stack:
+        clauses, lit, depth, mark = stack.pop()
+        while len(assignment) > mark:
+            assignment.popitem()
+        if lit:
+            assignment[abs(lit)] = lit > 0
+            # no empty clause can come out of this: that needs the unit clause
+            # [-lit], and the unit clause rule already removed all units
+            clauses = simplify_after_assignment(clauses, lit)
+
+        counters["calls"] += 1
+        # check for a stop request every 1024 calls
+        if should_stop is not None and counters["calls"] & 1023 == 0 and should_stop():
+            # same count as on success: this node and its path are still open
+            counters["backtracks"] += counters["calls"] - first_call - 1 - depth
+            raise SolverAborted
+        # 1. Unit clause rule
+        clauses, assignment, conflict = unit_clause_rule(clauses, assignment)
+        if conflict:
+            continue
+
+        # 2. Pure literal elimination
+        clauses, assignment = pure_literal_rule(clauses, assignment)
+
+        # 3. Check base cases
+        if not clauses:
+            # no clauses -> satisfied; every node visited so far failed,
+            # except the root and the `depth` nodes on the path to this one
+            counters["backtracks"] += counters["calls"] - first_call - 1 - depth
+            return True, assignment, counters
+        # below the root the unit clause rule reports every empty clause as
+        # a conflict, so only an empty input clause is left to look for
+        if not depth and check_empty_clause(clauses):
             continue
-        # recursion, move to next level in our tree
-        sat, final_assignment, counters = dpll(
-            new_clauses, new_assignment, num_vars, counters
-        )
-        if not sat:
-            counters["backtracks"] += 1
-        if sat:
-            return True, final_assignment, counters
 
+        # 4. Choose variable to split (heuristic)
+        var, pref_val = split(clauses, assignment, num_vars)
+        # if all variables already assigned, but not all clauses satisfied
+        if var is None:
+            continue
+
+        # 5. SPlit: preferred polarity on top, so it is tried first
+        counters["splits"] += 1
+        mark = len(assignment)
+        for lit in (-var, var) if pref_val else (var, -var):
+            stack.append((clauses, lit, depth + 1, mark))
+
+    # every node but the root failed
+    counters["backtracks"] += counters["calls"] - first_call - 1
     return False, {}, counters
 
 
@@ -242,18 +259,31 @@ def build_model(assignment, num_vars):
     return model
 
 
-def solve_cnf_random(clauses, num_vars, log=False):
+def solve_cnf_random(clauses, num_vars, log=False, should_stop=None, assignment=None):
     """
     Solve a CNF formula using a random branching heuristic.
     Return:
       ("SAT", model)  where model is a list of ints (DIMACS-style), or
       ("UNSAT", None)
+      ("ABORTED", None)  if should_stop() returned True during the search
+    `assignment` is an optional starting assignment, e.g. the variables
+    forced by simplifying the formula at the root. The clauses are
+    simplified by it first, and the model includes it.
     """
     init_counters = {"splits": 0, "backtracks": 0, "calls": 0}
 
     clause_sets = convert_clauses(clauses)
+    assignment = dict(assignment or {})
+    if assignment:
+        clause_sets = simplify_by_assignment(clause_sets, assignment)
     t0 = time.perf_counter()
-    sat, assignment, counters = dpll(clause_sets, {}, num_vars, init_counters)
+    try:
+        sat, assignment, counters = dpll(
+            clause_sets, assignment, num_vars, init_counters, should_stop
+        )
+        status = "SAT" if sat else "UNSAT"
+    except SolverAborted:
+        status, counters = "ABORTED", init_counters
     t1 = time.perf_counter()
     runtime = t1 - t0
     string = ""
@@ -266,11 +296,11 @@ def solve_cnf_random(clauses, num_vars, log=False):
     if log:
         print(string)
 
-    if sat:
+    if status == "SAT":
         model = build_model(assignment, num_vars)
         return "SAT", model, string
     else:
-        return "UNSAT", None, string
+        return status, None, string
 
 
 # python main.py --in puzzle.txt
@@ -52,37 +52,41 @@ def main():
 
 
 def parse_dimacs(input_path: str) -> Tuple[Iterable[Iterable[int]], int]:
-    close = False
+    # read the whole file at once and split it into tokens in one go,
+    # instead of going line by line
     if isinstance(input_path, str):
-        file = open(input_path, "r")
-        close = True
+        with open(input_path, "rb") as file:
+            data = file.read()
     else:
-        file = input_path
+        data = input_path.read()
+        if isinstance(data, str):
+            data = data.encode()
 
+    tokens = data.split()
 
-    line = file.readline()
-
-    components = line.strip().split(" ")
-
-    if len(components)!= 4 or components[0]!="p" or components[1]!="cnf":
+    if len(tokens) < 4 or tokens[0] != b"p" or tokens[1] != b"cnf":
       print("Wrong file format! Expected first line to be 'p cnf NUM_VARS NUM_CLAUSES")
       exit(1)
 
-    num_vars=int(components[2])
-    num_clauses=int(components[3])
+    num_vars=int(tokens[2])
+    num_clauses=int(tokens[3])
 
-    clauses=[]
+    numbers = list(map(int, tokens[4:]))
 
-    line=file.readline()
-    while(line):
-       numbers = [int(x) for x in line.strip().split(" ")]
+    clauses=[]
 
-       if(numbers[-1]!=0):
+    # every 0 ends a clause, list.index finds them without a python loop
+    start = 0
+    while start < len(numbers):
+       try:
+          end = numbers.index(0, start)
+       except ValueError:
           print("Wrong format! Clause lines must be terminated with a 0")
+          end = len(numbers)
 
-       clauses.append(numbers[:-1])
+       clauses.append(numbers[start:end])
 
-       line=file.readline()
+       start = end + 1
 
 
     return clauses, num_vars
@@ -7,251 +7,554 @@ Implement: solve_cnf(clauses) -> (status, model_or_None)"""
 
 
 from typing import Iterable, List, Tuple, Set, Dict
+from array import array
+from operator import neg
+import multiprocessing
+import os
+import queue
+import random
 import time
 
 
-def convert_clauses(clauses):
-  """Convert clauses to a list-of-sets"""
-  return [set(c) for c in clauses]
+# instances with more variables than this are solved by a portfolio of
+# differently seeded searches, one per core
+PORTFOLIO_MIN_VARS = 1000
 
-# --------------------
-# Simplification rules
-# --------------------
+# the pure literal rule only runs at the root and on every this many
+# decision levels; deeper in the search it seldom finds anything
+PURE_LITERAL_EVERY = 16
 
-def unit_clause_rule(clauses, assignment):
-    clauses = clauses[:]
-    assignment = dict(assignment)
 
-    while True:
-      # find unit clauses
-      unit_lits = []
-      for c in clauses:
-        if len(c) == 1:
-          unit_lits.append(next(iter(c)))
+class CNF:
+    """
+    Flat clause store for two watched literals, with the search state of
+    the solver.
+
+    - clause i lives in lits[clause_start[i]:clause_start[i + 1]]; the first
+      num_original clauses are the input, the rest are learned
+    - the first two literals of a clause are its watched literals, they are
+      swapped in place when a watch moves
+    - watches[lit] holds the ids of the clauses watching lit; negative
+      literals index from the back of the list
+    - binary clauses are not watched: bin_watches[lit] holds an (other
+      literal, clause id) pair per binary clause with lit, so a false lit
+      forces `other` without looking at the clause at all
+    - unit clauses of the input are kept apart in `units`, they are never
+      watched; `has_empty` is set for an empty input clause
+    - occ[lit] holds the ids of the input clauses containing lit, and
+      clause_sat[ci] the number of true literals of input clause ci
+    - lit_count[lit] is the number of open input clauses containing lit;
+      for an unassigned variable these are its DLCS counts CP and CN
+    - activity[var] is the VSIDS score of var, raised for the variables of
+      every conflicting clause; phase[var] is its last assigned value; a
+      `seed` starts both from small random values, so differently seeded
+      searches break ties differently
+    - level[var] is the decision level var was assigned at, reason[var] the
+      clause that propagated it (-1 for decisions); trail_lim[d] is the
+      trail position where level d + 1 starts, and qhead the trail position
+      of the next literal to propagate
+    """
 
-      if not unit_lits:
-        break
+    # the activity of all variables decays by this factor per conflict
+    DECAY = 0.95
+
+    def __init__(self, clauses, num_vars, seed=None):
+        self.lits = array("i")
+        self.clause_start = array("i", [0])
+        self.watches = [[] for _ in range(2 * num_vars + 1)]
+        self.bin_watches = [[] for _ in range(2 * num_vars + 1)]
+        self.units = []
+        self.has_empty = False
+        self.activity = [0.0] * (num_vars + 1)
+        self.bump_size = 1.0
+        self.phase = array("b", bytes(num_vars + 1))
+        if seed is not None:
+            rng = random.Random(seed)
+            # well below one bump, so only ties are affected
+            self.activity = [rng.random() * 1e-3 for _ in range(num_vars + 1)]
+            self.phase = array("b", [rng.choice((-1, 1)) for _ in range(num_vars + 1)])
+        self.level = array("i", [0]) * (num_vars + 1)
+        self.reason = array("i", [-1]) * (num_vars + 1)
+        self.trail_lim = []
+        self.qhead = 0
+        self.occ = [[] for _ in range(2 * num_vars + 1)]
+        self.lit_count = array("i", [0]) * (2 * num_vars + 1)
+        self.num_vars = num_vars
+
+        seen = set()
+        for c in clauses:
+            # identical clauses, in any literal order, are kept once
+            key = frozenset(c)
+            if key in seen:
+                continue
+            seen.add(key)
+            # a clause with both lit and -lit is always satisfied
+            if not key.isdisjoint(map(neg, key)):
+                continue
+            # drop duplicate literals
+            if len(key) < len(c):
+                c = list(dict.fromkeys(c))
+            if not c:
+                self.has_empty = True
+                continue
+            if len(c) == 1:
+                self.units.append(c[0])
+                continue
+            ci = self.add_clause(c)
+            for lit in c:
+                self.occ[lit].append(ci)
+                self.lit_count[lit] += 1
+        self.num_original = len(self.clause_start) - 1
+        self.clause_sat = array("i", [0]) * self.num_original
+
+    def add_clause(self, c):
+        """Add a clause of at least two literals, watching the first two."""
+        ci = len(self.clause_start) - 1
+        self.lits.extend(c)
+        self.clause_start.append(len(self.lits))
+        if len(c) == 2:
+            self.bin_watches[c[0]].append((c[1], ci))
+            self.bin_watches[c[1]].append((c[0], ci))
+        else:
+            self.watches[c[0]].append(ci)
+            self.watches[c[1]].append(ci)
+        return ci
+
+    def bump(self, ci):
+        """Raise the activity of the variables of conflicting clause ci."""
+        activity = self.activity
+        for lit in self.lits[self.clause_start[ci]:self.clause_start[ci + 1]]:
+            activity[abs(lit)] += self.bump_size
+        # growing the bump is the same as decaying every other activity
+        self.bump_size /= self.DECAY
+        if self.bump_size > 1e100:
+            self.activity = [a * 1e-100 for a in activity]
+            self.bump_size *= 1e-100
+
+
+def lit_value(lit, values):
+    """1 if the literal is true, -1 if it is false, 0 if it is unassigned."""
+    return values[lit]
+
+
+def assign(cnf, values, trail, lit, reason):
+    """Make `lit` true at the current decision level."""
+    var = abs(lit)
+    values[lit] = 1
+    values[-lit] = -1
+    cnf.level[var] = len(cnf.trail_lim)
+    cnf.reason[var] = reason
+    trail.append(lit)
+    satisfy(cnf, lit)
+
+
+def satisfy(cnf, lit):
+    """
+    Count `lit` as true in the input clauses containing it. A clause that
+    becomes satisfied takes its literals out of lit_count.
+    """
+    lits, clause_start = cnf.lits, cnf.clause_start
+    clause_sat, lit_count = cnf.clause_sat, cnf.lit_count
+    for ci in cnf.occ[lit]:
+      if not clause_sat[ci]:
+        for other in lits[clause_start[ci]:clause_start[ci + 1]]:
+          lit_count[other] -= 1
+      clause_sat[ci] += 1
 
-      for lit in unit_lits:
-        # check boolean of literal
-        var = abs(lit)
-        val = (lit > 0)
 
-        # check for conflict
-        if var in assignment:
-          if assignment[var] != val:
-              return clauses, assignment, True
-          else:
-              continue
+def decide(cnf, values, trail, lit):
+    """Open a new decision level and make `lit` true on it."""
+    cnf.trail_lim.append(len(trail))
+    assign(cnf, values, trail, lit, -1)
 
-        # put variable in assignment
-        assignment[var] = val
 
-        # simplify clauses:
-        new_clauses = []
-        # loop through clauses and check if the contain the unit lit
-        for c in clauses:
-          # unit clause satisfied, so remove
-          if lit in c:
-            continue
-          # literal falsified, so remove
-          if -lit in c:
-            new_c = set(c)
-            new_c.remove(-lit)
-            # empty clause, so conflict
-            if len(new_c) == 0:
-              return clauses, assignment, True
-            new_clauses.append(new_c)
-          # unit literal not in clause 
-          else:
-            new_clauses.append(c)
-        clauses = new_clauses
-        
-    return clauses, assignment, False
-
-
-def pure_literal_rule(clauses, assignment):
-    clauses = clauses[:]
-    assignment = dict(assignment)
+# --------------------
+# Simplification rules
+# --------------------
 
-    while True:
-      pos_occ: Dict[int,int] = {}
-      neg_occ: Dict[int,int] = {}
-      
-      for c in clauses:
-        for lit in c:
-          var = abs(lit)
-          # already assigned variable, so skip
-          if var in assignment:
-            continue
-          # add positive literal to the dict
-          if lit > 0:
-            pos_occ[var] = pos_occ.get(var,0) + 1
-          # add negative literal to the dict
-          else:
-            neg_occ[var] = neg_occ.get(var,0) + 1
-
-      pure_vars = []
-      for var in set(list(pos_occ.keys()) + list(neg_occ.keys())):
-        # already assigned, so continue
-        if var in assignment:
+def unit_clause_rule(cnf, values, trail):
+    """
+    Propagate the literals on the trail from qhead on with the watched
+    literals. Only the clauses watching a literal that became false are
+    visited; the literals they force are assigned and pushed on the trail.
+    Returns the id of a conflicting clause, or -1.
+
+    This is the hot loop of the solver, so everything it touches is bound
+    to a local name and lit_value is written out inline.
+    values holds both polarities, so a literal is looked up directly.
+    """
+    lits, clause_start, watches = cnf.lits, cnf.clause_start, cnf.watches
+    bin_watches = cnf.bin_watches
+    level, reason = cnf.level, cnf.reason
+    current = len(cnf.trail_lim)
+    push = trail.append
+    qhead = cnf.qhead
+
+    while qhead < len(trail):
+      lit = trail[qhead]
+      qhead += 1
+      false_lit = -lit
+
+      # binary clauses with the false literal force their other literal
+      for other, ci in bin_watches[false_lit]:
+        val = values[other]
+        if val > 0:
+          continue
+        # both literals false, so conflict
+        if val < 0:
+          cnf.bump(ci)
+          cnf.qhead = len(trail)
+          return ci
+        var = other if other > 0 else -other
+        values[other] = 1
+        values[-other] = -1
+        level[var] = current
+        reason[var] = ci
+        push(other)
+        satisfy(cnf, other)
+
+      # visit the clauses that watch the literal that became false
+      watching = watches[false_lit]
+      keep = []
+      keep_append = keep.append
+      for i, ci in enumerate(watching):
+        start = clause_start[ci]
+        # keep the false watch in the second slot
+        first = lits[start]
+        if first == false_lit:
+          first = lits[start + 1]
+          lits[start] = first
+          lits[start + 1] = false_lit
+        first_val = values[first]
+
+        # other watch true, so clause satisfied
+        if first_val > 0:
+          keep_append(ci)
           continue
-        p = pos_occ.get(var,0)
-        n = neg_occ.get(var,0)
-        # add true pure variable
-        if p > 0 and n == 0:
-          pure_vars.append((var, True))
-        # add false pure variable
-        elif n > 0 and p == 0:
-          pure_vars.append((var, False))
-
-      if not pure_vars:
-          break
 
-      # assign and simplify
-      for var, val in pure_vars:
-        # assign pure literal
-        assignment[var] = val
-        # update the clauses
-        lit = var if val else -var
-        new_clauses = []
-        for c in clauses:
-          # clause is satisfied, so skip
-          if lit in c:
-            continue
-          # clause does not have pure literal so don't change
-          new_clauses.append(c)
-        clauses = new_clauses
+        # look for a literal that is not false to watch instead
+        for k in range(start + 2, clause_start[ci + 1]):
+          other = lits[k]
+          if values[other] >= 0:
+            lits[start + 1] = other
+            lits[k] = false_lit
+            watches[other].append(ci)
+            break
+        else:
+          keep_append(ci)
+          # all other literals false, so conflict
+          if first_val < 0:
+            cnf.bump(ci)
+            keep.extend(watching[i + 1:])
+            watches[false_lit] = keep
+            cnf.qhead = len(trail)
+            return ci
+          # unit clause, so the other watch must be true
+          var = first if first > 0 else -first
+          values[first] = 1
+          values[-first] = -1
+          level[var] = current
+          reason[var] = ci
+          push(first)
+          satisfy(cnf, first)
+      watches[false_lit] = keep
+
+    cnf.qhead = qhead
+    return -1
+
+
+def pure_literal_rule(cnf, values, trail):
+    """
+    Assign the literals that occur in open input clauses while their
+    negation does not. Returns the number of literals assigned.
 
-    return clauses, assignment
+    A pure literal has no reason clause, so each one is assigned as a
+    decision of its own; conflict analysis then never meets a literal
+    without a reason that is not the decision of its level.
+    """
+    lit_count = cnf.lit_count
+    pure_lits = [
+        lit
+        for var in range(1, cnf.num_vars + 1)
+        if not values[var]
+        for lit in (var, -var)
+        if lit_count[lit] and not lit_count[-lit]
+    ]
+    for lit in pure_lits:
+      decide(cnf, values, trail, lit)
+    return len(pure_lits)
 
 
 # --------------------
 # Split
 # --------------------
 
-def split(clauses, assignment, num_vars):
+def split(cnf, values):
     """
     Chosen heuristic for splitting: DLCS
     Dynamic largest combined sum: CP(v) + CN(v) (= most frequent v)
     If CP(v)>CN(v) then v=1 else v=0
-    """
-    pos_count = {}
-    neg_count = {}
-
-    for c in clauses:
-      for lit in c:
-        var = abs(lit)
-        # already assigned, so skip
-        if var in assignment:
-            continue
-        # count positive occurences of literal
-        if lit > 0:
-            pos_count[var] = pos_count.get(var, 0) + 1
-        # count negative occurences of literal
-        else:
-            neg_count[var] = neg_count.get(var, 0) + 1
+    Returns (None, True) when every clause is satisfied.
 
-    best_var = None
-    best_score = -1
-    best_pref = True
+    Ties on the sum go to the most active variable (VSIDS), ties on the
+    polarity to the value the variable had last (phase saving).
 
-    for var in range(1, num_vars + 1):
-      if var in assignment:
-        continue
-      p = pos_count.get(var, 0)
-      n = neg_count.get(var, 0)
-      score = p + n
-      # update best score
-      if score > best_score:
-        best_score = score
-        best_var = var
-        best_pref = (p >= n)
+    CP and CN come from lit_count, which assign and undo keep up to date,
+    so no clause is scanned here.
+    """
+    lit_count, activity = cnf.lit_count, cnf.activity
+
+    # largest sum, then highest activity, then lowest variable
+    best = max(
+        (
+            (lit_count[var] + lit_count[-var], activity[var], -var)
+            for var in range(1, cnf.num_vars + 1)
+            if not values[var]
+        ),
+        default=(0, 0, 0),
+    )
+    # an open clause has at least two unassigned literals after propagation,
+    # so no score means every clause is satisfied
+    if not best[0]:
+      return None, True
+
+    best_var = -best[2]
+    p = lit_count[best_var]
+    n = lit_count[-best_var]
+    best_pref = p > n if p != n else cnf.phase[best_var] >= 0
 
     return best_var, best_pref
 
 
 # --------------------
-# Simplify
+# Conflict analysis
 # --------------------
-def check_empty_clause(clauses):
-  return any(len(c) == 0 for c in clauses)
 
-def simplify_after_assignment(clauses, lit):
+def analyze(cnf, values, trail, conflict):
     """
-    Given assignment of literal `lit` to True, remove satisfied clauses and remove -lit from other clauses.
+    First-UIP conflict analysis. Resolve the conflicting clause with the
+    reasons of the literals of the current level, latest first, until one
+    literal of the current level is left.
+    Returns (learned clause, level to jump back to). The first literal of
+    the learned clause is the negated UIP, the second one is of the jump
+    level, so both can be watched.
     """
-    new_clauses = []
-    for c in clauses:
-      # clause satisfied, so skip
-      if lit in c:
-        continue
-      # remove the negations of the literal from the clause
-      if -lit in c:
-        new_c = set(c)
-        new_c.remove(-lit)
-        new_clauses.append(new_c)
-      # clause not affected by literal
-      else:
-        new_clauses.append(c)
-    return new_clauses
+    lits, clause_start = cnf.lits, cnf.clause_start
+    level, reason = cnf.level, cnf.reason
+    current = len(cnf.trail_lim)
+
+    seen = set()
+    learned = [0]
+    # literals of the current level still to resolve
+    pending = 0
+    lit = 0
+    ci = conflict
+    idx = len(trail) - 1
+
+    while True:
+      for q in lits[clause_start[ci]:clause_start[ci + 1]]:
+        var = abs(q)
+        # skip the literal resolved on, and level 0, which is always false
+        if q == lit or var in seen or not level[var]:
+          continue
+        seen.add(var)
+        if level[var] == current:
+          pending += 1
+        else:
+          learned.append(q)
+
+      # latest literal of the current level in the clause
+      while abs(trail[idx]) not in seen:
+        idx -= 1
+      lit = trail[idx]
+      idx -= 1
+      pending -= 1
+      if not pending:
+        break
+      ci = reason[abs(lit)]
+
+    learned[0] = -lit
+    if len(learned) == 1:
+      return learned, 0
+
+    # the highest level among the rest is where the clause becomes unit
+    best = max(range(1, len(learned)), key=lambda k: level[abs(learned[k])])
+    learned[1], learned[best] = learned[best], learned[1]
+    return learned, level[abs(learned[1])]
 
 
 # --------------------
 # DPLL
 # --------------------
 
-def dpll(clauses, assignment, num_vars):
-    """Recursive DPLL."""
-    # 1. Unit clause rule
-    clauses, assignment, conflict = unit_clause_rule(clauses, assignment)
-    if conflict:
-        return False, {}
-    
-    # 2. Pure literal elimination
-    clauses, assignment = pure_literal_rule(clauses, assignment)
-
-    # 3. Check base cases
-    if not clauses:
-        # no clauses -> satisfied
-        return True, assignment
-    if check_empty_clause(clauses):
-        return False, {}
-
-    # 4. Choose variable to split (heuristic)
-    var, pref_val = split(clauses, assignment, num_vars)
-    # if all variables already assigned, but not all clauses satisfied
-    if var is None:
-      return False, {}
-
-    # 5. SPlit: try preferred polarity first
-    for try_val in (pref_val, not pref_val):
-      lit = var if try_val else -var
-      
-      new_assignment = dict(assignment)
-      new_assignment[var] = try_val
-      new_clauses = simplify_after_assignment(clauses, lit)
-      # if empty clause, not satisfied,backtrack, try oher value
-      if any(len(c) == 0 for c in new_clauses):
+def undo(cnf, values, trail, back_level):
+    """
+    Unassign everything above decision level `back_level`, saving the phase
+    of each variable. Watches stay valid.
+    """
+    lits, clause_start = cnf.lits, cnf.clause_start
+    phase, occ = cnf.phase, cnf.occ
+    clause_sat, lit_count = cnf.clause_sat, cnf.lit_count
+    mark = cnf.trail_lim[back_level]
+    while len(trail) > mark:
+      lit = trail.pop()
+      var = abs(lit)
+      phase[var] = values[var]
+      values[var] = 0
+      values[-var] = 0
+      for ci in occ[lit]:
+        clause_sat[ci] -= 1
+        # clause open again, count its literals back in
+        if not clause_sat[ci]:
+          for other in lits[clause_start[ci]:clause_start[ci + 1]]:
+            lit_count[other] += 1
+    del cnf.trail_lim[back_level:]
+    cnf.qhead = mark
+
+
+class SolverAborted(Exception):
+    """Raised inside dpll when the caller asked the search to stop."""
+
+
+def dpll(cnf, values, trail, should_stop=None):
+    """
+    DPLL with conflict-driven clause learning on one shared assignment.
+    A conflict is analysed into a learned clause, and the search jumps back
+    to the level where that clause forces its UIP literal, instead of
+    flipping the latest decision.
+    """
+    steps = 0
+    while True:
+      # check for a stop request every 1024 steps
+      steps += 1
+      if should_stop is not None and steps & 1023 == 0 and should_stop():
+        raise SolverAborted
+
+      # 1. Unit clause rule
+      conflict = unit_clause_rule(cnf, values, trail)
+      if conflict >= 0:
+        # conflict without decisions -> unsatisfiable
+        if not cnf.trail_lim:
+          return False
+        # 2. Learn and jump back
+        learned, back_level = analyze(cnf, values, trail, conflict)
+        undo(cnf, values, trail, back_level)
+        reason = cnf.add_clause(learned) if len(learned) > 1 else -1
+        assign(cnf, values, trail, learned[0], reason)
         continue
-      # recursion, move to next level in our tree
-      sat, final_assignment = dpll(new_clauses, new_assignment, num_vars)
-      if sat:
-        return True, final_assignment
 
-    return False, {}
+      # 3. Pure literal elimination
+      if len(cnf.trail_lim) % PURE_LITERAL_EVERY == 0:
+        if pure_literal_rule(cnf, values, trail):
+          continue
+
+      # 4. Choose variable to split (heuristic)
+      var, pref_val = split(cnf, values)
+      # no open clauses -> satisfied
+      if var is None:
+        return True
 
-def build_model(assignment, num_vars):
+      # 5. Split: try preferred polarity
+      decide(cnf, values, trail, var if pref_val else -var)
+
+
+def build_model(values, num_vars):
     """
     Build a full DIMACS-style model
     Unassigned variables are set to False
     """
-    model = []
-    for v in range(1, num_vars + 1):
-        val = assignment.get(v, False)
-        model.append(v if val else -v)
+    return [v if values[v] > 0 else -v for v in range(1, num_vars + 1)]
+
+def search(clauses, num_vars, seed=None, should_stop=None):
+    """
+    Build the clause store and run one search.
+    Returns the model, or None if the formula is unsatisfiable.
+    """
+    cnf = CNF(clauses, num_vars, seed)
+    # value per literal, so values[-lit] == -values[lit]:
+    # 0 = unset, 1 = True, -1 = False
+    values = array("b", bytes(2 * num_vars + 1))
+    trail = []
+    # empty clause, so unsatisfiable
+    if cnf.has_empty:
+      return None
+    # the unit clauses of the input are assigned at level 0
+    for lit in cnf.units:
+      val = lit_value(lit, values)
+      if val < 0:
+        return None
+      if not val:
+        assign(cnf, values, trail, lit, -1)
+    if not dpll(cnf, values, trail, should_stop):
+      return None
+    return build_model(values, num_vars)
+
+
+def portfolio_worker(clauses, num_vars, seed, stop_event, result_queue):
+    """
+    Portfolio worker: search with one seed until done or until another
+    worker has set `stop_event`. Puts (finished, model) on `result_queue`,
+    or (False, error) if the search failed.
+    """
+    try:
+      model = search(clauses, num_vars, seed, stop_event.is_set)
+    except SolverAborted:
+      result_queue.put((False, None))
+      return
+    except Exception as error:
+      # report the failure, otherwise the parent waits for this worker forever
+      result_queue.put((False, error))
+      return
+    # any verdict is final, so stop the others
+    stop_event.set()
+    result_queue.put((True, model))
+
+
+def search_portfolio(clauses, num_vars, workers):
+    """
+    Run `workers` searches at once: the unseeded one and workers - 1 seeded
+    ones. The first one to finish stops the rest.
+    Returns the model, or None if the formula is unsatisfiable.
+    Raises RuntimeError if no worker finished.
+    """
+    clauses = [list(c) for c in clauses]
+    stop_event = multiprocessing.Event()
+    result_queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=portfolio_worker,
+            args=(clauses, num_vars, seed, stop_event, result_queue),
+        )
+        for seed in [None] + list(range(1, workers))
+    ]
+    for process in processes:
+      process.start()
+
+    # every worker that exits normally puts exactly one result; read them
+    # all before joining, a worker with queued data does not exit
+    model, finished_any, error = None, False, None
+    pending = len(processes)
+    while pending:
+      try:
+        finished, result = result_queue.get(timeout=1)
+      except queue.Empty:
+        # a worker killed outright never puts its result
+        if not any(process.is_alive() for process in processes) and result_queue.empty():
+          break
+        continue
+      pending -= 1
+      if finished:
+        model, finished_any = result, True
+      elif result is not None:
+        error = result
+    for process in processes:
+      process.join()
+
+    if not finished_any:
+      raise RuntimeError("no portfolio worker finished the search") from error
     return model
 
+
 def solve_cnf_dlcs(clauses, num_vars):
     """
     Implement your SAT solver here.
@@ -259,17 +562,18 @@ def solve_cnf_dlcs(clauses, num_vars):
       ("SAT", model)  where model is a list of ints (DIMACS-style), or
       ("UNSAT", None)
     """
-  
-    clause_sets = convert_clauses(clauses)
+
     t0 = time.perf_counter()
-    sat, assignment = dpll(clause_sets, {}, num_vars)
+    workers = os.cpu_count() or 1
+    if num_vars > PORTFOLIO_MIN_VARS and workers > 1:
+      model = search_portfolio(clauses, num_vars, workers)
+    else:
+      model = search(clauses, num_vars)
     t1 = time.perf_counter()
     runtime = t1 - t0
     print(f"Runtime DLCS: {runtime}")
 
-    
-    if sat:
-      model = build_model(assignment, num_vars)
+    if model is not None:
       return "SAT", model
     else:
       return "UNSAT", None
@@ -7,7 +7,7 @@ Implement: solve_cnf(clauses) -> (status, model_or_None)"""
 
 
 from typing import Iterable, List, Tuple, Set, Dict
-from collections import deque
+from array import array
 import time
 
 
@@ -24,320 +24,421 @@ def convert_clauses(clauses: Iterable[Iterable[int]]) -> List[Tuple[int,...]]:
     return [tuple(c) for c in clauses]
 
 # --------------------
-# Simplification rules
+# Watched literals
 # --------------------
 
-def unit_clause_rule(clauses: List[Tuple[int,...]], assignment: Dict[int,bool]):
+class Solver:
     """
-    Unit propagation implemented using watched literals.
-
-    Input:
-      - clauses: list of clauses, each clause is a tuple of integers (literals).
-                 e.g. (1, -5, 12)
-      - assignment: dict mapping variable -> bool (partial assignment).
-                    e.g. {1: True, 3: False}
-
-    Output:
-      - simplified_clauses: a list of frozenset clauses with falsified literals removed
-                            and satisfied clauses removed (so the rest of code can continue).
-      - assignment: updated assignment (may have more variables assigned by unit propagation)
-      - conflict: bool, True if a conflict was detected.
+    Search state shared by every node of the DPLL tree.
+
+    - clauses: list of clauses, each clause is a tuple of integers (literals).
+               e.g. (1, -5, 12). The list is never changed during the search.
+    - value: signed byte array indexed by literal (partial assignment),
+             negative literals from the back: 0 = unset, 1 = True, -1 = False.
+             value[-lit] == -value[lit] always, so a literal is looked up
+             without abs() or a sign test, and its truth is the sign.
+    - trail: the literals made true, in order, so they can be undone.
+    - qhead: trail position of the next literal to propagate.
+    - trail_lim: the trail length at each decision.
+    - watched_pos / watchers: the watched-literal table, built once.
+    - bin_watches[lit]: for every binary clause containing lit, its other
+                        literal. Binary clauses are not in the watch table:
+                        once lit is false the other literal must be true,
+                        so no watch ever has to move.
+    - occ[lit]: the clause indices containing lit, negative literals from the back.
+    - clause_sat[ci]: the number of true literals in clause ci.
+    - lit_count[lit]: the number of open (not satisfied) clauses containing lit.
+    - pure_queue: literals that may have become pure, checked again on use.
+    - free[ci]: the number of literals of clause ci that are not false.
+    - score[lit]: the Jeroslow-Wang score, the sum of 2 ** -free[ci] over
+                  the open clauses ci containing lit.
 
     NOTES:
-      - This function uses a watched-literal table. It performs unit propagation
-        **without** scanning all clauses on every new assignment.
-      - It returns the simplified clause set as a list of frozensets so the rest of
-        your solver can operate as before.
+      - The watches do not need to be undone on backtrack: a clause watching
+        two literals that are not false stays valid when assignments are taken
+        back, because unassigning only makes literals "not false".
+      - The truth tests of literals are written out inline instead of calling
+        helper functions: a literal is true if value[lit] > 0 and false if
+        value[lit] < 0. The propagation loop runs for every literal visited, so a
+        call there is costly.
     """
 
-    # -------------------------
-    # Helper subroutines
-    # -------------------------
-    def lit_is_true(lit: int, asgn: Dict[int,bool]) -> bool:
-        """Return True if literal `lit` is known true by current assignment."""
-        v = abs(lit)
-        if v not in asgn:
-            return False
-        return asgn[v] == (lit > 0)
-
-    def lit_is_false(lit: int, asgn: Dict[int,bool]) -> bool:
-        """Return True if literal `lit` is known false by current assignment."""
-        v = abs(lit)
-        if v not in asgn:
-            return False
-        return asgn[v] != (lit > 0)
-
-    # -------------------------
-    # Build watches
-    # -------------------------
-    n_clauses = len(clauses)
-
-    # For each clause index, we store the two watched literal positions (i, j).
-    # If the clause has length 1 we will store the same literal twice (i == j).
-    watched_pos: List[Tuple[int,int]] = []
-    # watchers: map literal -> set of clause indices that currently watch that literal.
-    watchers: Dict[int, Set[int]] = {}
-
-    # queue for propagation: we store **literals that became TRUE** (not variables).
-    # When a literal lit becomes true, clauses that watch -lit may need to update.
-    queue = deque()
-
-    # initialize data structures
-    for ci, clause in enumerate(clauses):
-        L = len(clause)
-        if L == 0:
-            # empty clause -> immediate conflict
-            return clauses, assignment, True
-
-        # choose first two literal positions to watch, or duplicate if only one literal
-        if L == 1:
-            i1 = 0
-            i2 = 0
-        else:
-            i1 = 0
-            i2 = 1
-
-        watched_pos.append((i1, i2))
-
-        # register watchers for those two literals
-        for pos in (i1, i2):
-            lit = clause[pos]
-            watchers.setdefault(lit, set()).add(ci)
-
-    # If the current assignment already contains variables, enqueue their
-    # true-literals so we propagate their effects.
-    for var, val in list(assignment.items()):
-        lit = var if val else -var
-        queue.append(lit)
-
-    # Also find initial unit clauses and enqueue their required literal
-    for ci, clause in enumerate(clauses):
-        if len(clause) == 1:
-            lit = clause[0]
-            var = abs(lit)
-            val = (lit > 0)
-            # If variable already assigned inconsistently -> conflict
-            if var in assignment and assignment[var] != val:
-                return clauses, assignment, True
-            if var not in assignment:
-                assignment[var] = val
-                queue.append(lit)
-
-    # -------------------------
-    # Main propagation loop
-    # -------------------------
-    while queue:
-        true_lit = queue.popleft()
-        # If assignment contradicts the queued literal, conflict
-        v = abs(true_lit)
-        desired_val = (true_lit > 0)
-        if v in assignment and assignment[v] != desired_val:
-            # This situation is unlikely because we check conflicts on assignment,
-            # but it can happen if two queued unit literals contradict.
-            return clauses, assignment, True
-
-        # Clauses that watch -true_lit may be affected, because -true_lit is now false.
-        affected_watch_list = list(watchers.get(-true_lit, set()))
-        # NOTE: we copy the list because we'll modify the watchers dict while iterating.
-        for ci in affected_watch_list:
-            clause = clauses[ci]
-            i1, i2 = watched_pos[ci]
-            # determine which watched position corresponds to -true_lit
-            # Because we might have duplicate positions in 1-literal clauses, handle generically.
-            if clause[i1] == -true_lit:
-                false_watch_pos = i1
-                other_watch_pos = i2
-            elif clause[i2] == -true_lit:
-                false_watch_pos = i2
-                other_watch_pos = i1
+    def __init__(self, clauses: List[Tuple[int,...]], num_vars: int):
+        self.clauses = clauses
+        self.num_vars = num_vars
+        self.value = array("b", bytes(2 * num_vars + 1))
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        # set when the input alone is unsatisfiable
+        self.unsat = False
+
+        # For each clause index, we store the two watched literal positions (i, j).
+        # If the clause has length 1 we will store the same literal twice (i == j).
+        self.watched_pos: List[Tuple[int,int]] = []
+        # watchers[lit]: list of clause indices that currently watch that literal.
+        # Negative literals index from the back, so no offset is needed.
+        self.watchers: List[List[int]] = [[] for _ in range(2 * num_vars + 1)]
+        self.bin_watches: List[List[int]] = [[] for _ in range(2 * num_vars + 1)]
+
+        # queue for propagation: the trail from qhead on holds the **literals that
+        # became TRUE** (not variables) but are not propagated yet.
+        # When a literal lit becomes true, clauses that watch -lit may need to update.
+        # A literal is assigned when it joins the trail, so it is never queued twice.
+        self.qhead = 0
+
+        self.occ: List[List[int]] = [[] for _ in range(2 * num_vars + 1)]
+        self.clause_sat = array("i", [0]) * len(clauses)
+        self.lit_count = array("i", [0]) * (2 * num_vars + 1)
+        self.free = array("i", map(len, clauses))
+        self.score = array("d", [0.0]) * (2 * num_vars + 1)
+        # weight[k] = 2 ** -k, the weight of a clause with k free literals
+        self.weight = [2.0 ** -k for k in range(max(self.free, default=0) + 1)]
+
+        # unit clauses of the input, queued once all counts are in place
+        units = []
+
+        occ = self.occ
+        lit_count = self.lit_count
+        score = self.score
+        weight = self.weight
+        watched_pos = self.watched_pos
+        watchers = self.watchers
+        bin_watches = self.bin_watches
+
+        # initialize data structures, in a single pass over the clauses
+        for ci, clause in enumerate(clauses):
+            w = weight[len(clause)]
+            for lit in clause:
+                occ[lit].append(ci)
+                lit_count[lit] += 1
+                score[lit] += w
+
+            L = len(clause)
+            if L == 0:
+                # empty clause -> unsatisfiable, nothing to watch
+                self.unsat = True
+                watched_pos.append((0, 0))
+                continue
+
+            # choose first two literal positions to watch, or duplicate if only one literal
+            if L == 1:
+                i1 = 0
+                i2 = 0
+                units.append(clause[0])
+            elif L == 2:
+                # binary clause, implied literals instead of watches
+                watched_pos.append((0, 1))
+                bin_watches[clause[0]].append(clause[1])
+                bin_watches[clause[1]].append(clause[0])
+                continue
             else:
-                # Clause no longer watching -true_lit (maybe changed earlier) -> skip
+                i1 = 0
+                i2 = 1
+
+            watched_pos.append((i1, i2))
+
+            # register watchers for those two literals
+            watchers[clause[i1]].append(ci)
+            if i2 != i1:
+                watchers[clause[i2]].append(ci)
+
+        # literals that are pure from the start
+        self.pure_queue: List[int] = [
+            lit
+            for var in range(1, num_vars + 1)
+            for lit in (var, -var)
+            if lit_count[lit] and not lit_count[-lit]
+        ]
+
+        # Also enqueue the required literal of the initial unit clauses
+        for lit in units:
+            if not self.enqueue(lit):
+                # two unit clauses disagree -> unsatisfiable
+                self.unsat = True
+
+    def enqueue(self, lit: int) -> bool:
+        """
+        Make `lit` true and queue it for propagation.
+        Returns False if `lit` is already false.
+        """
+        value = self.value
+        if value[lit]:
+            return value[lit] > 0
+        value[lit] = 1
+        value[-lit] = -1
+        self.trail.append(lit)
+        self.satisfy(lit)
+        return True
+
+    def satisfy(self, lit: int):
+        """
+        Count the clauses containing the newly true `lit` as satisfied.
+        The literals of a clause that was open until now occur in one open
+        clause less, and a literal whose count hits zero makes its negation
+        pure. The clauses containing -lit have one free literal less, which
+        doubles the weight of the open ones in the scores.
+        """
+        value = self.value
+        clauses = self.clauses
+        clause_sat = self.clause_sat
+        lit_count = self.lit_count
+        free = self.free
+        score = self.score
+        weight = self.weight
+        for ci in self.occ[lit]:
+            clause_sat[ci] += 1
+            if clause_sat[ci] > 1:
+                continue
+            w = weight[free[ci]]
+            for other in clauses[ci]:
+                score[other] -= w
+                count = lit_count[other] - 1
+                lit_count[other] = count
+                if not count and lit_count[-other] and not value[other]:
+                    self.pure_queue.append(-other)
+        for ci in self.occ[-lit]:
+            f = free[ci]
+            free[ci] = f - 1
+            if clause_sat[ci]:
                 continue
+            # 2 ** -(f - 1) - 2 ** -f == 2 ** -f
+            w = weight[f]
+            for other in clauses[ci]:
+                score[other] += w
+
+    def decide(self, lit: int):
+        """Open a new decision level and make `lit` true on it."""
+        self.trail_lim.append(len(self.trail))
+        self.enqueue(lit)
+
+    def backtrack(self):
+        """Undo every assignment of the latest decision level."""
+        value = self.value
+        trail = self.trail
+        clauses = self.clauses
+        occ = self.occ
+        clause_sat = self.clause_sat
+        lit_count = self.lit_count
+        free = self.free
+        score = self.score
+        weight = self.weight
+        mark = self.trail_lim.pop()
+        while len(trail) > mark:
+            lit = trail.pop()
+            value[lit] = 0
+            value[-lit] = 0
+            # undo satisfy in reverse order, the -lit clauses first
+            for ci in occ[-lit]:
+                f = free[ci] + 1
+                free[ci] = f
+                if not clause_sat[ci]:
+                    w = weight[f]
+                    for other in clauses[ci]:
+                        score[other] -= w
+            for ci in occ[lit]:
+                clause_sat[ci] -= 1
+                # clause open again, count its literals back in
+                if not clause_sat[ci]:
+                    w = weight[free[ci]]
+                    for other in clauses[ci]:
+                        lit_count[other] += 1
+                        score[other] += w
+        self.qhead = mark
+        # the pure literals before the decision were all assigned already
+        self.pure_queue.clear()
+
+    def propagate(self) -> bool:
+        """
+        Unit propagation implemented using watched literals, on the queued
+        literals. It performs unit propagation **without** scanning all
+        clauses on every new assignment.
+        Returns True if a conflict was detected.
+        """
+        clauses = self.clauses
+        value = self.value
+        watched_pos = self.watched_pos
+        watchers = self.watchers
+        bin_watches = self.bin_watches
+        trail = self.trail
+        trail_push = trail.append
+        satisfy = self.satisfy
+        qhead = self.qhead
+
+        # -------------------------
+        # Main propagation loop
+        # -------------------------
+        while qhead < len(trail):
+            true_lit = trail[qhead]
+            qhead += 1
+            # negated once here, not for every clause below
+            false_lit = -true_lit
+
+            # Binary clauses with false_lit: the other literal must be true now
+            for other_lit in bin_watches[false_lit]:
+                other_val = value[other_lit]
+                if other_val > 0:
+                    continue
+                if other_val:
+                    # both literals false -> conflict
+                    self.qhead = len(trail)
+                    return True
+                value[other_lit] = 1
+                value[-other_lit] = -1
+                trail_push(other_lit)
+                satisfy(other_lit)
+
+            # Clauses that watch false_lit may be affected, because it is now false.
+            # NOTE: we walk the list by index and shrink it in place when a watch
+            # moves away, so it is never copied. j only advances past clauses
+            # that keep watching false_lit.
+            false_watchers = watchers[false_lit]
+            j = 0
+            while j < len(false_watchers):
+                ci = false_watchers[j]
+                clause = clauses[ci]
+                i1, i2 = watched_pos[ci]
+                # determine which watched position corresponds to false_lit
+                # Because we might have duplicate positions in 1-literal clauses, handle generically.
+                if clause[i1] == false_lit:
+                    false_watch_pos = i1
+                    other_watch_pos = i2
+                elif clause[i2] == false_lit:
+                    false_watch_pos = i2
+                    other_watch_pos = i1
+                else:
+                    # Clause no longer watching false_lit (maybe changed earlier) -> skip
+                    j += 1
+                    continue
 
-            other_lit = clause[other_watch_pos]
+                other_lit = clause[other_watch_pos]
 
-            # If the other watched literal is true, clause is satisfied -> nothing to do.
-            if lit_is_true(other_lit, assignment):
-                # No need to move the watch; clause is already satisfied.
-                continue
+                # If the other watched literal is true, clause is satisfied -> nothing to do.
+                other_val = value[other_lit]
+                if other_val > 0:
+                    # No need to move the watch; clause is already satisfied.
+                    j += 1
+                    continue
 
-            # Try to find a new literal in clause to watch (one that is not false)
-            found_new_watch = False
-            for idx, cand in enumerate(clause):
-                if idx == other_watch_pos or idx == false_watch_pos:
+                # Try to find a new literal in clause to watch (one that is not false)
+                found_new_watch = False
+                for idx, cand in enumerate(clause):
+                    if idx == other_watch_pos or idx == false_watch_pos:
+                        continue
+                    # candidate is ok if it is not currently assigned false
+                    if value[cand] >= 0:
+                        # move watch from false_watch_pos -> idx
+                        # 1) remove clause index from watchers[false_lit]; order does
+                        #    not matter, so move the last entry into its slot, which
+                        #    is looked at next
+                        false_watchers[j] = false_watchers[-1]
+                        false_watchers.pop()
+                        # 2) add clause index to watchers[cand]
+                        watchers[cand].append(ci)
+                        # 3) update watched positions for the clause
+                        if false_watch_pos == i1:
+                            watched_pos[ci] = (idx, other_watch_pos)
+                        else:
+                            watched_pos[ci] = (other_watch_pos, idx)
+                        found_new_watch = True
+                        break
+
+                if found_new_watch:
+                    # We successfully moved the false watch to another literal; the clause
+                    # is now safe from immediate conflict.
                     continue
-                # candidate is ok if it is not currently assigned false
-                if not lit_is_false(cand, assignment):
-                    # move watch from false_watch_pos -> idx
-                    # 1) remove clause index from watchers[-true_lit]
-                    watchers[-true_lit].discard(ci)
-                    # 2) add clause index to watchers[cand]
-                    watchers.setdefault(cand, set()).add(ci)
-                    # 3) update watched positions for the clause
-                    if false_watch_pos == i1:
-                        watched_pos[ci] = (idx, other_watch_pos)
-                    else:
-                        watched_pos[ci] = (other_watch_pos, idx)
-                    found_new_watch = True
-                    break
-
-            if found_new_watch:
-                # We successfully moved the false watch to another literal; the clause
-                # is now safe from immediate conflict.
-                continue
 
-            # Could not find a new watch: the clause only has the "other_lit"
-            # as a candidate (or all other literals are false). Two cases:
-            # - other_lit is unassigned -> unit clause -> assign it true
-            # - other_lit is assigned false -> conflict
-            if lit_is_false(other_lit, assignment):
-                # clause is unsatisfiable under current partial assignment -> conflict
-                return clauses, assignment, True
-
-            # other_lit must be unassigned (since it's not true and not false)
-            ov = abs(other_lit)
-            oval = (other_lit > 0)
-            # assign the variable and enqueue
-            if ov in assignment:
-                # if already assigned to different value -> conflict (shouldn't happen due to checks)
-                if assignment[ov] != oval:
-                    return clauses, assignment, True
-            else:
-                assignment[ov] = oval
-                queue.append(other_lit)
+                # Could not find a new watch: the clause only has the "other_lit"
+                # as a candidate (or all other literals are false). Two cases:
+                # - other_lit is unassigned -> unit clause -> assign it true
+                # - other_lit is assigned false -> conflict
+                j += 1
+                if other_val:
+                    # clause is unsatisfiable under current partial assignment -> conflict
+                    self.qhead = len(trail)
+                    return True
+
+                # other_lit must be unassigned (since it's not true and not false)
+                # assign the variable and enqueue
+                value[other_lit] = 1
+                value[-other_lit] = -1
+                trail_push(other_lit)
+                satisfy(other_lit)
                 # Note: Do not change watchers here. The clause remains watching other_lit
-                # (and the false watch is still -true_lit which we attempted to move and failed).
+                # (and the false watch is still false_lit which we attempted to move and failed).
                 # The effect of newly assigning other_lit will be handled when that literal
-                # is popped from the queue (and we will process clauses watching -other_lit).
-                # We do NOT remove or rebuild clauses here.
-
-    # -------------------------
-    # After propagation: build simplified clause list to return
-    # -------------------------
-    simplified = []
-    for clause in clauses:
-        # if any literal in clause is true -> clause satisfied -> skip it
-        skip_clause = False
-        new_clause_lits = []
-        for lit in clause:
-            if lit_is_true(lit, assignment):
-                skip_clause = True
-                break
-            if not lit_is_false(lit, assignment):
-                # keep unassigned literals
-                new_clause_lits.append(lit)
-            # if lit is false, we drop it (we do not include it in new_clause_lits)
-        if skip_clause:
-            continue
-        if len(new_clause_lits) == 0:
-            # empty clause -> conflict
-            return clauses, assignment, True
-        # store as frozenset so rest of your solver can use set operations if needed
-        simplified.append(frozenset(new_clause_lits))
+                # is reached on the trail (and we will process clauses watching -other_lit).
 
-    # return the simplified clause list and updated assignment
-    return simplified, assignment, False
+        self.qhead = qhead
+        return False
 
 
-def pure_literal_rule(clauses, assignment):
-    clauses = clauses[:]
-    assignment = dict(assignment)
+# --------------------
+# Simplification rules
+# --------------------
 
-    while True:
-      pos_occ: Dict[int,int] = {}
-      neg_occ: Dict[int,int] = {}
-      
-      for c in clauses:
-        for lit in c:
-          var = abs(lit)
-          # already assigned variable, so skip
-          if var in assignment:
-            continue
-          # add positive literal to the dict
-          if lit > 0:
-            pos_occ[var] = pos_occ.get(var,0) + 1
-          # add negative literal to the dict
-          else:
-            neg_occ[var] = neg_occ.get(var,0) + 1
-
-      pure_vars = []
-      for var in set(list(pos_occ.keys()) + list(neg_occ.keys())):
-        # already assigned, so continue
-        if var in assignment:
-          continue
-        p = pos_occ.get(var,0)
-        n = neg_occ.get(var,0)
-        # add true pure variable
-        if p > 0 and n == 0:
-          pure_vars.append((var, True))
-        # add false pure variable
-        elif n > 0 and p == 0:
-          pure_vars.append((var, False))
-
-      if not pure_vars:
-          break
-
-      # assign and simplify
-      for var, val in pure_vars:
-        # assign pure literal
-        assignment[var] = val
-        # update the clauses
-        lit = var if val else -var
-        new_clauses = []
-        for c in clauses:
-          # clause is satisfied, so skip
-          if lit in c:
-            continue
-          # clause does not have pure literal so don't change
-          new_clauses.append(c)
-        clauses = new_clauses
+def pure_literal_rule(solver):
+    """
+    Assign the pure literals found while clauses got satisfied.
+    Returns the number of literals assigned.
+
+    solver.lit_count[lit] is the number of open clauses containing lit.
+    satisfy() queues a literal as soon as the count of its negation drops
+    to zero, so no clause has to be scanned here.
+    """
+    value = solver.value
+    lit_count = solver.lit_count
+    pure_queue = solver.pure_queue
+
+    count = 0
+    while pure_queue:
+      lit = pure_queue.pop()
+      # the queue can hold stale entries, so check again
+      if value[lit] or lit_count[-lit] or not lit_count[lit]:
+        continue
+      # assigning it can make more literals pure, they are queued too
+      solver.enqueue(lit)
+      count += 1
 
-    return clauses, assignment
+    # move the watches off the literals made false; a pure literal only
+    # satisfies clauses, so this never conflicts
+    if count:
+      solver.propagate()
+
+    return count
 
 
 # --------------------
 # Split
 # --------------------
 
-def split(clauses, assignment, num_vars):
+def split(solver):
     """
     Chosen heuristic for splitting: Jeroslow Wang Two Sided
-    
+
+    The solver keeps the scores up to date as literals get assigned and
+    unassigned, so no clause is visited here.
+    Returns None as variable if every clause is satisfied.
     """
-    pos_score = {}
-    neg_score = {}
-
-    for c in clauses:
-        # every clause gets a weight dependend on it's length
-        weight = 2 ** (-len(c))
-        # loop through literals in clause
-        for lit in c:
-            var = abs(lit)
-            # already assigned, so skip
-            if var in assignment:
-                continue
-            # add the positive scores of the variable
-            if lit > 0:
-                pos_score[var] = pos_score.get(var, 0.0) + weight
-            # add the negative scores of the variable
-            else:
-                neg_score[var] = neg_score.get(var, 0.0) + weight
+    value = solver.value
+    score = solver.score
+    lit_count = solver.lit_count
 
-    # pick best variable
+    # pick best variable; a variable in no open clause is never picked.
+    # That is decided on the integer counts: a float score can round to 0
+    # while one of its clauses is still open
     best_var = None
     best_score = -1.0
     best_pref = True
 
-    for var in range(1, num_vars + 1):
-        # already assigned, so skip
-        if var in assignment:
+    for var in range(1, solver.num_vars + 1):
+        # already assigned, or in no open clause, so skip
+        if value[var] or not (lit_count[var] or lit_count[-var]):
             continue
-        p = pos_score.get(var, 0.0)
-        n = neg_score.get(var, 0.0)
-        score = p + n
+        p = score[var]
+        n = score[-var]
         # update best score
-        if score > best_score:
-            best_score = score
+        if p + n > best_score:
+            best_score = p + n
             best_var = var
             best_pref = (p >= n)
 
@@ -345,85 +446,56 @@ def split(clauses, assignment, num_vars):
 
 
 # --------------------
-# Simplify
+# DPLL
 # --------------------
-def check_empty_clause(clauses):
-  return any(len(c) == 0 for c in clauses)
 
-def simplify_after_assignment(clauses, lit):
+def dpll(solver):
     """
-    Given assignment of literal `lit` to True, remove satisfied clauses and remove -lit from other clauses.
+    Iterative DPLL on the shared solver state, with an explicit decision
+    stack instead of recursion, so deep search trees do not hit the
+    recursion limit. Every branch is a decision level on the trail, and a
+    failed branch is undone with backtrack, so no clauses or assignments
+    are copied.
     """
-    new_clauses = []
-    for c in clauses:
-      # clause satisfied, so skip
-      if lit in c:
-        continue
-      # remove the negations of the literal from the clause
-      if -lit in c:
-        new_c = set(c)
-        new_c.remove(-lit)
-        new_clauses.append(new_c)
-      # clause not affected by literal
-      else:
-        new_clauses.append(c)
-    return new_clauses
-
-
-# --------------------
-# DPLL
-# --------------------
+    # one entry per decision level: the literal of the untried branch, or 0
+    untried = []
 
-def dpll(clauses, assignment, num_vars):
-    """Recursive DPLL."""
-    # 1. Unit clause rule
-    clauses, assignment, conflict = unit_clause_rule(clauses, assignment)
-    if conflict:
-        return False, {}
-    
-    # 2. Pure literal elimination
-    clauses, assignment = pure_literal_rule(clauses, assignment)
-
-    # 3. Check base cases
-    if not clauses:
-        # no clauses -> satisfied
-        return True, assignment
-    if check_empty_clause(clauses):
-        return False, {}
-
-    # 4. Choose variable to split (heuristic)
-    var, pref_val = split(clauses, assignment, num_vars)
-    # if all variables already assigned, but not all clauses satisfied
-    if var is None:
-      return False, {}
-
-    # 5. SPlit: try preferred polarity first
-    for try_val in (pref_val, not pref_val):
-      lit = var if try_val else -var
-      
-      new_assignment = dict(assignment)
-      new_assignment[var] = try_val
-      new_clauses = simplify_after_assignment(clauses, lit)
-      # if empty clause, not satisfied,backtrack, try oher value
-      if any(len(c) == 0 for c in new_clauses):
-        continue
-      # recursion, move to next level in our tree
-      sat, final_assignment = dpll(new_clauses, new_assignment, num_vars)
-      if sat:
-        return True, final_assignment
+    while True:
+        # 1. Unit clause rule
+        if not solver.propagate():
+            # 2. Pure literal elimination
+            pure_literal_rule(solver)
+
+            # 3. Choose variable to split (heuristic)
+            var, pref_val = split(solver)
+            # no open clauses -> satisfied; an open clause always has an unassigned
+            # literal left, otherwise propagate would have found the conflict
+            if var is None:
+                return True
+
+            # 4. SPlit: try preferred polarity first
+            lit = var if pref_val else -var
+            untried.append(-lit)
+            solver.decide(lit)
+            continue
 
-    return False, {}
+        # 5. Backtrack to the latest decision with an untried branch
+        while True:
+            if not untried:
+                return False
+            other = untried.pop()
+            solver.backtrack()
+            if other:
+                untried.append(0)
+                solver.decide(other)
+                break
 
-def build_model(assignment, num_vars):
+def build_model(value, num_vars):
     """
     Build a full DIMACS-style model
     Unassigned variables are set to False
     """
-    model = []
-    for v in range(1, num_vars + 1):
-        val = assignment.get(v, False)
-        model.append(v if val else -v)
-    return model
+    return [v if value[v] > 0 else -v for v in range(1, num_vars + 1)]
 
 def solve_cnf(clauses, num_vars):
     """
@@ -435,12 +507,13 @@ def solve_cnf(clauses, num_vars):
   
     clause_sets = convert_clauses(clauses)
     t0 = time.perf_counter()
-    sat, assignment = dpll(clause_sets, {}, num_vars)
+    solver = Solver(clause_sets, num_vars)
+    sat = not solver.unsat and dpll(solver)
     t1 = time.perf_counter()
     runtime = t1 - t0
     print(f"Runtime JW watched: {runtime}")
     if sat:
-      model = build_model(assignment, num_vars)
+      model = build_model(solver.value, num_vars)
       return "SAT", model
     else:
       return "UNSAT", None